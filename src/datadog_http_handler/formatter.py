@@ -1,9 +1,73 @@
 import json
 import logging
+import math
 import os
-from typing import Optional
+from typing import Any, Optional
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+
+def _dumps(obj: dict[str, Any]) -> str:
+    """Serialize a log entry, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            # Hand datetimes and dataclasses to default=str as the stdlib does,
+            # so those extras keep the same value with or without orjson
+            return orjson.dumps(
+                obj,
+                default=str,
+                option=orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            ).decode()
+        except TypeError:
+            # orjson rejects some values the stdlib accepts (e.g. ints over
+            # 64 bits or lone surrogates), so fall through for those records
+            pass
+    return json.dumps(obj, default=str, ensure_ascii=False)
+
+
+# Standard LogRecord attributes, never reported as extra fields
+_STANDARD_FIELDS = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "levelname",
+        "levelno",
+        "pathname",
+        "filename",
+        "module",
+        "lineno",
+        "funcName",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+        "taskName",
+        "getMessage",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "message",
+    }
+)
+
+# Flat Datadog attributes that ddtrace may inject, lifted to the top level
+_DD_FLAT_KEYS = frozenset(
+    {"dd.trace_id", "dd.span_id", "dd.service", "dd.version", "dd.env"}
+)
+
+# Attributes the extra-field pass never looks at; nested "dd" is handled first
+_SKIPPED_FIELDS = _STANDARD_FIELDS | {"dd"}
+
 
 class DatadogJsonFormatter(logging.Formatter):
     """
@@ -22,9 +86,57 @@ class DatadogJsonFormatter(logging.Formatter):
             version: Version of the service (optional)
         """
         super().__init__()
-        self.service_name = service_name
-        self.version = version or os.getenv("SERVICE_VERSION", "unknown")
-        self.environment = os.getenv("DD_ENV", "development")
+        self._service_name = service_name
+        self._version = version or os.environ.get("SERVICE_VERSION", "unknown")
+        self._environment = os.getenv("DD_ENV", "development")
+        self._build_entry_template()
+        # (whole second, "YYYY-MM-DDTHH:MM:SS") for the last formatted second
+        self._ts_cache: tuple[int, str] = (-1, "")
+
+    def _build_entry_template(self) -> None:
+        """Rebuild the base entry that format() copies for each record."""
+        # Per-service constants are filled in; the per-record keys are
+        # placeholders so a copy keeps the field order
+        self._entry_template: dict[str, Any] = {
+            "timestamp": None,
+            "level": None,
+            "logger": None,
+            "message": None,
+            "service": self._service_name,
+            "version": self._version,
+            "env": self._environment,
+            "process_id": None,
+        }
+
+    @property
+    def service_name(self) -> str:
+        """Service name reported on every log entry."""
+        return self._service_name
+
+    @service_name.setter
+    def service_name(self, value: str) -> None:
+        self._service_name = value
+        self._build_entry_template()
+
+    @property
+    def version(self) -> str:
+        """Service version reported on every log entry."""
+        return self._version
+
+    @version.setter
+    def version(self, value: str) -> None:
+        self._version = value
+        self._build_entry_template()
+
+    @property
+    def environment(self) -> str:
+        """Environment reported on every log entry."""
+        return self._environment
+
+    @environment.setter
+    def environment(self, value: str) -> None:
+        self._environment = value
+        self._build_entry_template()
 
     def format(self, record: logging.LogRecord) -> str:
         """
@@ -36,22 +148,27 @@ class DatadogJsonFormatter(logging.Formatter):
         Returns:
             JSON-formatted log string
         """
-        # Base log structure for Datadog
-        log_entry = {
-            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-            "service": self.service_name,
-            "version": self.version,
-            "env": self.environment,
-            "process_id": record.process,
-        }
+        # Records built by hand or by other libraries often carry values outside
+        # typeshed's declarations (e.g. funcName=None), so read them untyped.
+        # This also keeps mypyc from inserting type checks on each attribute.
+        rec: Any = record
+
+        # Base log structure for Datadog, copied from the per-service template
+        log_entry: dict[str, Any] = self._entry_template.copy()
+        log_entry["timestamp"] = self._format_timestamp(rec.created)
+        log_entry["level"] = rec.levelname
+        log_entry["logger"] = rec.name
+        # Most records are a plain string with no arguments to interpolate
+        msg = rec.msg
+        log_entry["message"] = (
+            msg if type(msg) is str and not rec.args else rec.getMessage()
+        )
+        log_entry["process_id"] = rec.process
 
         # --- Datadog correlation IDs (must be at top level) ---
         # First check nested dd fields
-        if hasattr(record, "dd"):
-            dd_fields = record.dd
+        if hasattr(rec, "dd"):
+            dd_fields = rec.dd
             if "trace_id" in dd_fields:
                 log_entry["dd.trace_id"] = dd_fields["trace_id"]
             if "span_id" in dd_fields:
@@ -63,70 +180,72 @@ class DatadogJsonFormatter(logging.Formatter):
             if "env" in dd_fields:
                 log_entry["dd.env"] = dd_fields["env"]
 
-        # Then check for flat Datadog attributes that ddtrace may inject
-        dd_flat_keys = ["dd.trace_id", "dd.span_id", "dd.service", "dd.version", "dd.env"]
-        for dd_key in dd_flat_keys:
-            # Only use flat key if we don't already have this field from record.dd
-            if dd_key not in log_entry and hasattr(record, dd_key):
-                log_entry[dd_key] = getattr(record, dd_key)
-
         # --- Add source info ---
-        if record.pathname:
+        if rec.pathname:
             log_entry["source"] = {
-                "file": record.pathname,
-                "line": record.lineno,
-                "function": record.funcName,
+                "file": rec.pathname,
+                "line": rec.lineno,
+                "function": rec.funcName,
             }
 
-        # --- Collect remaining extras, except dd (already flattened) ---
-        extra_fields = {
-            k: v
-            for k, v in record.__dict__.items()
-            if k
-            not in {
-                "name",
-                "msg",
-                "args",
-                "levelname",
-                "levelno",
-                "pathname",
-                "filename",
-                "module",
-                "lineno",
-                "funcName",
-                "created",
-                "msecs",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "processName",
-                "process",
-                "getMessage",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-                "message",
-                "dd",  # skip dd because we handled it
-                "dd.trace_id",  # skip flat dd keys because we handled them
-                "dd.span_id",
-                "dd.service",
-                "dd.version",
-                "dd.env",
-            }
-        }
-        if extra_fields:
-            log_entry["extra"] = extra_fields
+        # --- Flat dd.* attributes and remaining extras, in a single pass ---
+        # The set difference runs in C and is empty for most records
+        record_dict: dict[str, Any] = rec.__dict__
+        extra_keys = record_dict.keys() - _SKIPPED_FIELDS
+        if extra_keys:
+            extra_fields: dict[str, Any] = {}
+            for k, v in record_dict.items():
+                if k not in extra_keys:
+                    continue
+                if k in _DD_FLAT_KEYS:
+                    # Only use flat key if we don't already have it from record.dd
+                    log_entry.setdefault(k, v)
+                else:
+                    extra_fields[k] = v
+            if extra_fields:
+                log_entry["extra"] = extra_fields
 
         # --- Exception handling ---
-        if record.exc_info:
+        if rec.exc_info:
             log_entry["exception"] = {
-                "class": record.exc_info[0].__name__ if record.exc_info[0] else None,
-                "message": str(record.exc_info[1]) if record.exc_info[1] else None,
-                "traceback": self.formatException(record.exc_info),
+                "class": rec.exc_info[0].__name__ if rec.exc_info[0] else None,
+                "message": str(rec.exc_info[1]) if rec.exc_info[1] else None,
+                "traceback": self.formatException(rec.exc_info),
             }
 
-        if record.stack_info:
-            log_entry["stack_trace"] = record.stack_info
+        if rec.stack_info:
+            log_entry["stack_trace"] = rec.stack_info
+
+        return _dumps(log_entry)
+
+    def _format_timestamp(self, created: float) -> str:
+        """
+        Format a record timestamp as ISO 8601 in UTC.
 
-        return json.dumps(log_entry, default=str, ensure_ascii=False)
+        Produces the same string as ``datetime.isoformat()`` but only builds a
+        datetime once per second; the sub-second part is formatted by hand.
 
+        Args:
+            created: Seconds since the epoch
+
+        Returns:
+            ISO 8601 timestamp ending in ``+00:00``
+        """
+        seconds = math.floor(created)
+        micros = round((created - seconds) * 1e6)
+        if micros >= 1_000_000:
+            seconds += 1
+            micros -= 1_000_000
+
+        # The cache is swapped as one tuple, so concurrent callers never see a
+        # second paired with another second's prefix
+        cached_seconds, prefix = self._ts_cache
+        if seconds != cached_seconds:
+            prefix = datetime.fromtimestamp(seconds, tz=timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%S"
+            )
+            self._ts_cache = (seconds, prefix)
+
+        if micros:
+            return f"{prefix}.{micros:06d}+00:00"
+        return f"{prefix}+00:00"
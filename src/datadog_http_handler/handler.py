@@ -5,18 +5,97 @@ This module provides the DatadogHTTPHandler class, a modern Python logging handl
 that sends logs to Datadog via HTTP API with asynchronous batching and retry logic.
 """
 
+import copy
+import functools
 import logging
+import math
 import os
 import threading
 import time
-from queue import Empty, Queue
-from typing import Optional
+from collections import deque
+from typing import Generic, Optional, TypeVar
 
 from datadog_api_client import ApiClient, Configuration
 from datadog_api_client.v2.api.logs_api import LogsApi
+from datadog_api_client.v2.model.content_encoding import ContentEncoding
 from datadog_api_client.v2.model.http_log import HTTPLog
 from datadog_api_client.v2.model.http_log_item import HTTPLogItem
 
+_T = TypeVar("_T")
+
+
+class _MpscRing(Generic[_T]):
+    """
+    Bounded multi-producer, single-consumer ring buffer.
+
+    Producers only serialize on a short lock around the tail reservation; the
+    slot itself is written outside the lock. The single consumer reads slots
+    in order without any locking and stops at the first slot that has been
+    reserved but not yet published.
+
+    ``not_empty`` is set by producers once at least ``watermark`` items are
+    pending and only when it is currently clear, so an idle consumer is woken
+    once per burst rather than once per record.
+    """
+
+    __slots__ = (
+        "_tail_lock",
+        "buf",
+        "dropped",
+        "head",
+        "mask",
+        "not_empty",
+        "tail",
+        "watermark",
+    )
+
+    def __init__(self, capacity: int, watermark: int = 1) -> None:
+        # Round up to a power of two so slot indexes can be masked
+        capacity = 1 << max(capacity - 1, 1).bit_length()
+        self.buf: list[Optional[_T]] = [None] * capacity
+        self.mask = capacity - 1
+        self.head = 0  # Next slot to read, owned by the consumer
+        self.tail = 0  # Next slot to reserve, guarded by _tail_lock
+        self.dropped = 0  # Items rejected while full, guarded by _tail_lock
+        self.watermark = max(1, watermark)
+        self.not_empty = threading.Event()
+        self._tail_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.tail - self.head
+
+    def offer(self, item: _T) -> bool:
+        """Publish an item, returning False (and counting it) if the ring is full."""
+        with self._tail_lock:
+            tail = self.tail
+            if tail - self.head > self.mask:
+                self.dropped += 1
+                return False
+            self.tail = tail + 1
+
+        self.buf[tail & self.mask] = item
+        if tail + 1 - self.head >= self.watermark and not self.not_empty.is_set():
+            self.not_empty.set()
+        return True
+
+    def drain_into(self, out: list[_T], max_items: int) -> int:
+        """Move up to ``max_items`` published items into ``out`` (consumer only)."""
+        buf = self.buf
+        mask = self.mask
+        head = self.head
+        count = 0
+        while count < max_items and head != self.tail:
+            item = buf[head & mask]
+            if item is None:
+                # Slot reserved but the producer has not stored it yet
+                break
+            buf[head & mask] = None
+            out.append(item)
+            head += 1
+            count += 1
+        self.head = head
+        return count
+
 
 class DatadogHTTPHandler(logging.Handler):
     """
@@ -37,6 +116,13 @@ class DatadogHTTPHandler(logging.Handler):
         flush_interval_seconds: How often to flush logs (seconds)
         timeout_seconds: Request timeout
         max_retries: Maximum retry attempts
+        max_queue_size: Maximum number of logs buffered for the background worker
+            (rounded up to a power of two)
+        sync_mode: Send each log from the calling thread without a background
+            worker, for use behind an existing async boundary such as
+            logging.handlers.QueueListener
+        worker_cpu: CPU to pin the background worker to, keeping its buffers in
+            one core's cache (Linux only; default: not pinned)
         level: Logging level
 
     Example:
@@ -72,6 +158,9 @@ class DatadogHTTPHandler(logging.Handler):
         flush_interval_seconds: float = 5.0,
         timeout_seconds: float = 10.0,
         max_retries: int = 3,
+        max_queue_size: int = 10000,
+        sync_mode: bool = False,
+        worker_cpu: Optional[int] = None,
         level: int = logging.NOTSET,
     ) -> None:
         """Initialize the Datadog HTTP handler."""
@@ -95,22 +184,59 @@ class DatadogHTTPHandler(logging.Handler):
         self.flush_interval = max(0.1, flush_interval_seconds)  # Minimum 100ms
         self.timeout = max(1.0, timeout_seconds)  # Minimum 1 second
         self.max_retries = max(0, max_retries)  # No negative retries
+        self.max_queue_size = max(self.batch_size, max_queue_size)
+        self.sync_mode = sync_mode
+        if worker_cpu is not None and (
+            not isinstance(worker_cpu, int) or worker_cpu < 0
+        ):
+            raise ValueError(
+                f"worker_cpu must be a non-negative CPU number, got {worker_cpu!r}"
+            )
+        self.worker_cpu = worker_cpu
 
         # Initialize API client
         self._setup_api_client()
 
+        # Tags that only depend on the record's level and logger name are built
+        # once per pair; environment and version are read at startup
+        self._env_tags = [
+            f"{name}:{value}"
+            for name, value in (
+                ("env", os.getenv("DD_ENV")),
+                ("version", os.getenv("DD_VERSION")),
+            )
+            if value
+        ]
+        self._base_tags = functools.lru_cache(maxsize=1024)(self._build_base_tags)
+
+        # Reusable log items, recycled by _send_batch once a batch is submitted
+        self._item_pool: deque[HTTPLogItem] = deque(
+            (HTTPLogItem(message="") for _ in range(self.batch_size * 2)),
+            maxlen=self.batch_size * 2,
+        )
+
         # Background processing
-        self._log_queue: Queue[HTTPLogItem] = Queue()
         self._stop_event = threading.Event()
         self._worker_thread: Optional[threading.Thread] = None
-        self._start_worker()
+        if not self.sync_mode:
+            # Wake the worker early once the pending logs fill 30% of a batch;
+            # otherwise it sleeps until the flush interval elapses
+            self._ring: _MpscRing[logging.LogRecord] = _MpscRing(
+                self.max_queue_size, watermark=math.ceil(self.batch_size * 0.3)
+            )
+            self._pending: list[logging.LogRecord] = []  # Owned by the worker
+            self._reported_drops = 0  # Owned by the worker thread
+            self._start_worker()
 
     def _setup_api_client(self) -> None:
         """Setup the Datadog API client."""
         configuration = Configuration()
         configuration.api_key["apiKeyAuth"] = self.api_key
         configuration.server_variables["site"] = self.site
+        configuration.request_timeout = self.timeout
 
+        # The client is created once per handler; its urllib3 pool keeps the
+        # TLS connection alive across batches and retries
         self.api_client = ApiClient(configuration)
         self.logs_api = LogsApi(self.api_client)
 
@@ -122,46 +248,101 @@ class DatadogHTTPHandler(logging.Handler):
 
     def _worker(self) -> None:
         """Background worker that processes log batches."""
+        if self.worker_cpu is not None:
+            self._pin_worker(self.worker_cpu)
+
+        ring = self._ring
         batch: list[HTTPLogItem] = []
-        last_flush = time.time()
+        last_flush = time.monotonic()
 
         while not self._stop_event.is_set():
-            try:
-                # Get log from queue with timeout
-                log_item = self._log_queue.get(timeout=0.1)
-                batch.append(log_item)
-
-                # Check if we should flush
-                should_flush = len(batch) >= self.batch_size or (
-                    batch and time.time() - last_flush >= self.flush_interval
-                )
-
-                if should_flush:
-                    self._send_batch(batch)
-                    batch.clear()
-                    last_flush = time.time()
-
-            except Empty:
-                # No logs in queue, check if we should flush existing batch
-                if batch and time.time() - last_flush >= self.flush_interval:
-                    self._send_batch(batch)
-                    batch.clear()
-                    last_flush = time.time()
-                continue
+            # Wait until enough logs are pending or the flush interval elapses
+            remaining = self.flush_interval - (time.monotonic() - last_flush)
+            if remaining > 0 and len(ring) < ring.watermark:
+                ring.not_empty.wait(timeout=remaining)
+
+            # Keep sending while full batches, or at least a watermark's worth
+            # of logs, are waiting, so the tail of a burst goes out with it but
+            # the few logs that trickle in during a send wait for the threshold
+            while not self._stop_event.is_set():
+                ring.not_empty.clear()
+                if not self._fill_batch(batch):
+                    break
+                full = len(batch) >= self.batch_size
+                self._send_batch(batch)
+                batch.clear()
+                if not full and len(ring) < ring.watermark:
+                    break
+            last_flush = time.monotonic()
 
         # Flush remaining logs on shutdown
-        if batch:
+        while self._fill_batch(batch):
             self._send_batch(batch)
+            batch.clear()
+
+    def _pin_worker(self, cpu: int) -> None:
+        """Restrict the calling (worker) thread to a single CPU, where supported."""
+        try:
+            # pid 0 is the calling thread on Linux
+            os.sched_setaffinity(0, {cpu})
+        except (AttributeError, OSError, OverflowError, ValueError) as e:
+            # Unsupported platform or CPU not available to this process;
+            # logging still works, just without pinning
+            self._handle_error(f"Could not pin worker to CPU {cpu}: {e}")
+
+    def _fill_batch(self, batch: list[HTTPLogItem]) -> int:
+        """Drain and format pending logs into the batch, reporting any dropped."""
+        records = self._pending
+        self._ring.drain_into(records, self.batch_size)
+        for record in records:
+            try:
+                batch.append(self._format_log_item(record))
+            except Exception:
+                self.handleError(record)
+        records.clear()
+
+        dropped = self._ring.dropped - self._reported_drops
+        if dropped:
+            self._reported_drops += dropped
+            notice = logging.LogRecord(
+                name=__name__,
+                level=logging.WARNING,
+                pathname="",
+                lineno=0,
+                msg="DatadogHTTPHandler dropped %d log records because the queue was full",
+                args=(dropped,),
+                exc_info=None,
+            )
+            try:
+                batch.append(self._format_log_item(notice))
+            except Exception as e:
+                # handleError() would print the notice's traceback as if it
+                # came from the application, so report it directly instead
+                self._handle_error(f"{notice.getMessage()} ({e})")
+
+        return len(batch)
 
     def _send_batch(self, batch: list[HTTPLogItem]) -> None:
         """Send a batch of logs to Datadog."""
         if not batch:
             return
 
+        try:
+            self._submit_batch(batch)
+        finally:
+            # The request body is serialized by now, so the items can be reused
+            self._item_pool.extend(batch)
+
+    def _submit_batch(self, batch: list[HTTPLogItem]) -> None:
+        """Submit a batch of logs to Datadog, retrying on failure."""
+        # The SDK serializes the whole batch as one JSON array; gzipping it
+        # compresses the service, source and tags repeated on every item
+        http_log = HTTPLog(batch)
         for attempt in range(self.max_retries + 1):
             try:
-                http_log = HTTPLog(batch)
-                self.logs_api.submit_log(body=http_log)
+                self.logs_api.submit_log(
+                    body=http_log, content_encoding=ContentEncoding.GZIP
+                )
                 return  # Success
 
             except Exception as e:
@@ -170,9 +351,14 @@ class DatadogHTTPHandler(logging.Handler):
                     self._handle_error(
                         f"Failed to send logs after {self.max_retries + 1} attempts: {e}"
                     )
-                else:
-                    # Wait before retry (exponential backoff)
-                    time.sleep(2**attempt)
+                elif self._stop_event.wait(min(2**attempt, 30)):
+                    # Wait before retry (exponential backoff), but give up
+                    # straight away if the handler is closed meanwhile
+                    self._handle_error(
+                        f"Handler closed, dropping {len(batch)} logs after "
+                        f"{attempt + 1} failed attempts: {e}"
+                    )
+                    return
 
     def _handle_error(self, message: str) -> None:
         """Handle errors that occur during log submission."""
@@ -182,13 +368,33 @@ class DatadogHTTPHandler(logging.Handler):
     def emit(self, record: logging.LogRecord) -> None:
         """Emit a log record."""
         try:
+            # Loggers skip handlers below their level before calling them, but
+            # QueueListener does not by default, so check again before any work
+            if self.level and record.levelno < self.level:
+                return
+
             # Ensure handler is properly initialized
-            if not hasattr(self, "_log_queue") or not hasattr(self, "api_key"):
+            if not hasattr(self, "_stop_event") or not hasattr(self, "api_key"):
                 # Handler not properly initialized, skip logging to avoid errors
                 return
 
-            log_item = self._format_log_item(record)
-            self._log_queue.put(log_item, block=False)
+            if self.sync_mode:
+                # The caller already runs off the application thread
+                self._send_batch([self._format_log_item(record)])
+                return
+
+            # Formatting happens on the worker thread, so enqueue a copy: later
+            # handlers may add attributes to the shared record, and must still
+            # see its original arguments. Merge the arguments into the copy's
+            # message now, since the caller may mutate them after we return.
+            record = copy.copy(record)
+            if record.args:
+                record.msg = record.getMessage()
+                record.args = None
+
+            # Never block the caller: when the queue is full the record is
+            # dropped and counted, and the worker reports the count later
+            self._ring.offer(record)
         except Exception:
             self.handleError(record)
 
@@ -197,34 +403,18 @@ class DatadogHTTPHandler(logging.Handler):
         # Format the message
         message = self.format(record)
 
-        # Build the log item
-        log_item = HTTPLogItem(
-            message=message,
-            ddsource=self.source,
-            service=self.service,
-            hostname=self.hostname,
-        )
-
-        # Add tags
-        tags_list = []
-        if self.tags:
-            tags_list.extend(self.tags.split(","))
-
-        # Add log level as tag
-        tags_list.append(f"level:{record.levelname.lower()}")
-
-        # Add logger name as tag
-        tags_list.append(f"logger:{record.name}")
-
-        # Add environment if available
-        env = os.getenv("DD_ENV")
-        if env:
-            tags_list.append(f"env:{env}")
+        # Build the log item, reusing a pooled one when available. Every field
+        # is overwritten below, so recycled items need no clearing.
+        try:
+            log_item = self._item_pool.pop()
+        except IndexError:
+            log_item = HTTPLogItem(message=message)
+        log_item.message = message
+        log_item.ddsource = self.source
+        log_item.service = self.service
+        log_item.hostname = self.hostname
 
-        # Add version if available
-        version = os.getenv("DD_VERSION")
-        if version:
-            tags_list.append(f"version:{version}")
+        tags_list = [self._base_tags(record.levelname, record.name)]
 
         # Add any extra fields from the log record
         if hasattr(record, "__dict__"):
@@ -233,11 +423,27 @@ class DatadogHTTPHandler(logging.Handler):
                     # Custom Datadog fields
                     tags_list.append(f"{key[3:]}:{value}")
 
-        if tags_list:
-            log_item.ddtags = ",".join(tags_list)
+        log_item.ddtags = ",".join(tags_list)
 
         return log_item
 
+    def _build_base_tags(self, levelname: str, logger_name: str) -> str:
+        """Build the tag string shared by all records of a level and logger."""
+        tags_list = []
+        if self.tags:
+            tags_list.extend(self.tags.split(","))
+
+        # Add log level as tag
+        tags_list.append(f"level:{levelname.lower()}")
+
+        # Add logger name as tag
+        tags_list.append(f"logger:{logger_name}")
+
+        # Add environment and version if available
+        tags_list.extend(self._env_tags)
+
+        return ",".join(tags_list)
+
     def flush(self) -> None:
         """Flush any pending logs."""
         # Signal worker to process remaining logs
@@ -246,7 +452,8 @@ class DatadogHTTPHandler(logging.Handler):
             and self._worker_thread
             and self._worker_thread.is_alive()
         ):
-            # Wait a bit for the worker to process
+            # Wake the worker and wait a bit for it to process
+            self._ring.not_empty.set()
             time.sleep(0.1)
 
     def close(self) -> None:
@@ -254,6 +461,8 @@ class DatadogHTTPHandler(logging.Handler):
         # Stop the worker
         if hasattr(self, "_stop_event"):
             self._stop_event.set()
+        if hasattr(self, "_ring"):
+            self._ring.not_empty.set()
 
         # Wait for worker to finish
         if (
@@ -278,7 +487,9 @@ class DatadogHTTPHandler(logging.Handler):
         """
         try:
             # Check if worker thread is alive
-            if not self._worker_thread or not self._worker_thread.is_alive():
+            if not self.sync_mode and (
+                not self._worker_thread or not self._worker_thread.is_alive()
+            ):
                 return False
 
             # Check if we can create a test log item
@@ -291,15 +502,20 @@ class DatadogHTTPHandler(logging.Handler):
                 args=(),
                 exc_info=None,
             )
-            self._format_log_item(test_record)
+            self._item_pool.append(self._format_log_item(test_record))
             return True
 
         except Exception:
             return False
 
+    @property
+    def dropped_count(self) -> int:
+        """Total number of log records dropped because the queue was full."""
+        return self._ring.dropped if hasattr(self, "_ring") else 0
+
     def get_queue_size(self) -> int:
         """Get the current size of the log queue."""
-        return self._log_queue.qsize() if hasattr(self, "_log_queue") else 0
+        return len(self._ring) if hasattr(self, "_ring") else 0
 
     def __repr__(self) -> str:
         """Return a string representation of the handler."""
@@ -38,6 +38,20 @@ class TestDatadogJsonFormatter:
         assert formatter.version == "2.0.0"
         assert formatter.environment == "production"
 
+    def test_changing_service_fields_after_init(self):
+        """Test that service, version and env can still be changed after init."""
+        formatter = DatadogJsonFormatter(service_name="test-service", version="1.0.0")
+        formatter.service_name = "renamed"
+        formatter.version = "2.0.0"
+        formatter.environment = "staging"
+
+        record = logging.makeLogRecord({"msg": "Test message"})
+        log_data = json.loads(formatter.format(record))
+
+        assert log_data["service"] == "renamed"
+        assert log_data["version"] == "2.0.0"
+        assert log_data["env"] == "staging"
+
     def test_basic_log_formatting(self):
         """Test basic log record formatting."""
         formatter = DatadogJsonFormatter(service_name="test-service", version="1.0.0")
@@ -93,6 +107,26 @@ class TestDatadogJsonFormatter:
         assert log_data["message"] == "Test message with parameter and 42"
         assert log_data["level"] == "WARNING"
 
+    def test_log_with_non_string_message(self):
+        """Test that non-string messages are still converted with str()."""
+        formatter = DatadogJsonFormatter(service_name="test-service")
+
+        record = logging.LogRecord(
+            name="test.logger",
+            level=logging.INFO,
+            pathname="/path/to/file.py",
+            lineno=123,
+            msg=ValueError("not a string"),
+            args=(),
+            exc_info=None,
+        )
+        record.process = 12345
+
+        result = formatter.format(record)
+        log_data = json.loads(result)
+
+        assert log_data["message"] == "not a string"
+
     def test_log_with_nested_dd_fields(self):
         """Test log formatting with nested Datadog fields."""
         formatter = DatadogJsonFormatter(service_name="test-service")
@@ -294,6 +328,21 @@ class TestDatadogJsonFormatter:
         assert log_data["timestamp"] == expected_timestamp
         assert log_data["timestamp"].endswith("+00:00")
 
+    def test_timestamp_matches_isoformat_with_fractional_seconds(self):
+        """Test that cached timestamps match datetime.isoformat() exactly."""
+        formatter = DatadogJsonFormatter(service_name="test-service")
+
+        for created in (
+            1609459200.0,
+            1609459200.25,
+            1609459200.000001,
+            1609459200.9999996,  # rounds up into the next second
+            1609459201.5,
+            1609459200.123456,
+        ):
+            expected = datetime.fromtimestamp(created, tz=timezone.utc).isoformat()
+            assert formatter._format_timestamp(created) == expected
+
     def test_json_serialization_with_non_serializable_objects(self):
         """Test that non-JSON serializable objects are handled gracefully."""
         formatter = DatadogJsonFormatter(service_name="test-service")
@@ -319,6 +368,56 @@ class TestDatadogJsonFormatter:
         assert "datetime_obj" in log_data["extra"]
         assert "set_obj" in log_data["extra"]
 
+    def test_json_serialization_with_values_outside_orjson_range(self):
+        """Test that values orjson cannot encode fall back to the stdlib."""
+        formatter = DatadogJsonFormatter(service_name="test-service")
+
+        record = logging.LogRecord(
+            name="test.logger",
+            level=logging.INFO,
+            pathname="/path/to/file.py",
+            lineno=123,
+            msg="Test message",
+            args=(),
+            exc_info=None,
+        )
+        record.process = 12345
+        record.big_number = 2**70
+        record.by_code = {404: "not found"}
+
+        result = formatter.format(record)
+        log_data = json.loads(result)
+
+        assert log_data["extra"]["big_number"] == 2**70
+        assert log_data["extra"]["by_code"] == {"404": "not found"}
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_datetime_extra_serialized_as_str(self, use_orjson):
+        """Test that datetime extras match str() whether or not orjson is used."""
+        formatter = DatadogJsonFormatter(service_name="test-service")
+
+        record = logging.LogRecord(
+            name="test.logger",
+            level=logging.INFO,
+            pathname="/path/to/file.py",
+            lineno=123,
+            msg="Test message",
+            args=(),
+            exc_info=None,
+        )
+        record.process = 12345
+        record.started_at = datetime(2024, 1, 2, 3, 4, 5)
+
+        if use_orjson:
+            pytest.importorskip("orjson")
+            result = formatter.format(record)
+        else:
+            with patch("datadog_http_handler.formatter.orjson", None):
+                result = formatter.format(record)
+        log_data = json.loads(result)
+
+        assert log_data["extra"]["started_at"] == "2024-01-02 03:04:05"
+
     def test_exclude_standard_log_fields_from_extra(self):
         """Test that standard logging fields are excluded from extra."""
         formatter = DatadogJsonFormatter(service_name="test-service")
@@ -5,8 +5,10 @@ import time
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+from datadog_api_client.v2.model.content_encoding import ContentEncoding
 
 from datadog_http_handler import DatadogHTTPHandler
+from datadog_http_handler.handler import _MpscRing
 
 
 class TestDatadogHTTPHandler:
@@ -36,6 +38,8 @@ class TestDatadogHTTPHandler:
         handler = DatadogHTTPHandler(**handler_config)
 
         mock_api_client.assert_called_once()
+        configuration = mock_api_client.call_args[0][0]
+        assert configuration.request_timeout == handler.timeout
         assert hasattr(handler, "api_client")
         assert hasattr(handler, "logs_api")
 
@@ -48,6 +52,62 @@ class TestDatadogHTTPHandler:
         assert handler._worker_thread.is_alive()
         assert handler._worker_thread.daemon
 
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_worker_pinned_to_cpu(self, mock_api_client, handler_config):
+        """Test that the worker thread pins itself when worker_cpu is set."""
+        handler_config["worker_cpu"] = 0
+
+        with patch("os.sched_setaffinity", create=True) as mock_setaffinity:
+            handler = DatadogHTTPHandler(**handler_config)
+            handler.close()
+
+        mock_setaffinity.assert_called_once_with(0, {0})
+
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_worker_cpu_rejects_negative(self, mock_api_client, handler_config):
+        """Test that a negative worker_cpu is rejected at construction."""
+        handler_config["worker_cpu"] = -1
+
+        with pytest.raises(ValueError, match="worker_cpu"):
+            DatadogHTTPHandler(**handler_config)
+
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_worker_runs_unpinned_when_cpu_unusable(
+        self, mock_api_client, handler_config
+    ):
+        """Test that the worker keeps running if the CPU cannot be used."""
+        handler_config["worker_cpu"] = 2**64
+
+        with patch.object(DatadogHTTPHandler, "_handle_error") as mock_handle_error:
+            handler = DatadogHTTPHandler(**handler_config)
+            time.sleep(0.1)
+
+            assert handler.health_check() is True
+            mock_handle_error.assert_called_once()
+            handler.close()
+
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_sync_mode_sends_without_worker(
+        self, mock_api_client, handler_config, sample_log_record
+    ):
+        """Test that sync mode sends from the caller with no worker thread."""
+        mock_logs_api = MagicMock()
+        handler_config["sync_mode"] = True
+
+        with patch.object(DatadogHTTPHandler, "_setup_api_client"):
+            handler = DatadogHTTPHandler(**handler_config)
+            handler.logs_api = mock_logs_api
+
+            assert handler._worker_thread is None
+            assert not hasattr(handler, "_ring")
+            assert handler.health_check() is True
+
+            handler.emit(sample_log_record)
+
+            mock_logs_api.submit_log.assert_called_once()
+            assert handler.get_queue_size() == 0
+            handler.close()
+
     @patch("datadog_http_handler.handler.ApiClient")
     def test_emit_log_record(self, mock_api_client, handler_config, sample_log_record):
         """Test emitting a log record."""
@@ -59,6 +119,42 @@ class TestDatadogHTTPHandler:
         # Check that log was added to queue
         assert handler.get_queue_size() > 0
 
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_emit_skips_records_below_level(
+        self, mock_api_client, handler_config, sample_log_record
+    ):
+        """Test that records below the handler level are neither queued nor dropped."""
+        handler_config["level"] = logging.WARNING
+        handler = DatadogHTTPHandler(**handler_config)
+
+        handler.emit(sample_log_record)
+
+        assert handler.get_queue_size() == 0
+        assert handler.dropped_count == 0
+        # Arguments are left for other handlers to format
+        assert sample_log_record.args == ("parameter",)
+
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_emit_defers_formatting_to_worker(
+        self, mock_api_client, handler_config, sample_log_record
+    ):
+        """Test that emit only freezes the message and enqueues a copy."""
+        with patch.object(DatadogHTTPHandler, "_start_worker"):
+            handler = DatadogHTTPHandler(**handler_config)
+
+        with patch.object(handler, "_format_log_item") as mock_format:
+            handler.emit(sample_log_record)
+
+        mock_format.assert_not_called()
+        queued = handler._ring.buf[0]
+        assert queued is not None
+        assert queued is not sample_log_record
+        assert queued.msg == "Test log message with parameter"
+        assert queued.args is None
+        # Handlers after this one still see the record as the logger built it
+        assert sample_log_record.msg == "Test log message with %s"
+        assert sample_log_record.args == ("parameter",)
+
     @patch("datadog_http_handler.handler.ApiClient")
     def test_format_log_item(self, mock_api_client, handler_config, sample_log_record):
         """Test log item formatting."""
@@ -84,6 +180,21 @@ class TestDatadogHTTPHandler:
             assert "env:production" in log_item.ddtags
             assert "version:1.0.0" in log_item.ddtags
 
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_format_log_item_caches_base_tags(
+        self, mock_api_client, handler_config, sample_log_record
+    ):
+        """Test that level and logger tags are built once per pair."""
+        handler = DatadogHTTPHandler(**handler_config)
+        sample_log_record.dd_user = "alice"
+
+        first = handler._format_log_item(sample_log_record).ddtags
+        second = handler._format_log_item(sample_log_record).ddtags
+
+        assert first == second
+        assert first.endswith(",user:alice")
+        assert handler._base_tags.cache_info().hits == 1
+
     @patch("datadog_http_handler.handler.ApiClient")
     def test_batch_sending(self, mock_api_client, handler_config):
         """Test batch sending functionality."""
@@ -100,8 +211,10 @@ class TestDatadogHTTPHandler:
             # Test batch sending
             handler._send_batch(mock_log_items)
 
-            # Verify API was called
+            # Verify API was called with a gzip-compressed body
             mock_logs_api.submit_log.assert_called_once()
+            _, kwargs = mock_logs_api.submit_log.call_args
+            assert kwargs["content_encoding"] == ContentEncoding.GZIP
 
     @patch("datadog_http_handler.handler.ApiClient")
     def test_batch_sending_with_retry(self, mock_api_client, handler_config):
@@ -117,12 +230,45 @@ class TestDatadogHTTPHandler:
             mock_log_items = [MagicMock() for _ in range(3)]
 
             # Test batch sending with retry
-            with patch("time.sleep"):  # Speed up test
+            with patch.object(handler._stop_event, "wait", return_value=False):
                 handler._send_batch(mock_log_items)
 
             # Verify API was called twice (original + 1 retry)
             assert mock_logs_api.submit_log.call_count == 2
 
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_log_items_recycled_after_send(
+        self, mock_api_client, handler_config, sample_log_record
+    ):
+        """Test that sent log items are returned to the pool and reused."""
+        with patch.object(DatadogHTTPHandler, "_setup_api_client"):
+            handler = DatadogHTTPHandler(**handler_config)
+            handler.logs_api = MagicMock()
+            handler._item_pool.clear()
+
+            log_item = handler._format_log_item(sample_log_record)
+            handler._send_batch([log_item])
+
+            assert handler._format_log_item(sample_log_record) is log_item
+            assert log_item.message == "Test log message with parameter"
+
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_close_interrupts_retry_backoff(self, mock_api_client, handler_config):
+        """Test that closing the handler stops waiting between retries."""
+        mock_logs_api = MagicMock()
+        mock_logs_api.submit_log.side_effect = Exception("Network error")
+
+        with patch.object(DatadogHTTPHandler, "_setup_api_client"):
+            handler = DatadogHTTPHandler(**handler_config)
+            handler.logs_api = mock_logs_api
+            handler._stop_event.set()
+
+            start = time.monotonic()
+            handler._send_batch([MagicMock() for _ in range(3)])
+
+            assert time.monotonic() - start < 0.5
+            assert mock_logs_api.submit_log.call_count == 1
+
     @patch("datadog_http_handler.handler.ApiClient")
     def test_health_check(self, mock_api_client, handler_config):
         """Test health check functionality."""
@@ -158,6 +304,70 @@ class TestDatadogHTTPHandler:
         # Queue size should increase
         assert handler.get_queue_size() > initial_size
 
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_full_queue_drops_and_reports(
+        self, mock_api_client, handler_config, sample_log_record
+    ):
+        """Test that a full queue drops records and the worker reports them."""
+        mock_logs_api = MagicMock()
+        handler_config["max_queue_size"] = 8
+
+        # Log items are recycled after sending, so capture messages up front
+        sent: list[str] = []
+        mock_logs_api.submit_log.side_effect = lambda body, **kwargs: sent.extend(
+            item.message for item in body.value
+        )
+
+        with patch.object(DatadogHTTPHandler, "_setup_api_client"):
+            with patch.object(DatadogHTTPHandler, "_start_worker"):
+                handler = DatadogHTTPHandler(**handler_config)
+            handler.logs_api = mock_logs_api
+
+            for _ in range(10):
+                handler.emit(sample_log_record)
+
+            assert handler.get_queue_size() == 8
+            assert handler.dropped_count == 2
+
+            # Run the worker's shutdown drain in this thread
+            handler._stop_event.set()
+            handler._worker()
+        assert len(sent) == 9
+        assert sum("dropped 2 log records" in message for message in sent) == 1
+
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_drop_notice_format_error_reported(
+        self, mock_api_client, handler_config, sample_log_record
+    ):
+        """Test that a formatter failing on the drop notice does not stop the worker."""
+
+        class NoticeFailingFormatter(logging.Formatter):
+            def format(self, record):
+                if record.name == "datadog_http_handler.handler":
+                    raise RuntimeError("cannot format notice")
+                return super().format(record)
+
+        mock_logs_api = MagicMock()
+        handler_config["max_queue_size"] = 8
+
+        with patch.object(DatadogHTTPHandler, "_setup_api_client"):
+            with patch.object(DatadogHTTPHandler, "_start_worker"):
+                handler = DatadogHTTPHandler(**handler_config)
+            handler.logs_api = mock_logs_api
+            handler.setFormatter(NoticeFailingFormatter())
+
+            for _ in range(10):
+                handler.emit(sample_log_record)
+
+            # Run the worker's shutdown drain in this thread
+            handler._stop_event.set()
+            with patch.object(handler, "_handle_error") as mock_handle_error:
+                handler._worker()
+
+        assert handler.get_queue_size() == 0
+        mock_handle_error.assert_called_once()
+        assert "dropped 2 log records" in mock_handle_error.call_args[0][0]
+
     @patch("datadog_http_handler.handler.ApiClient")
     def test_repr(self, mock_api_client, handler_config):
         """Test string representation."""
@@ -192,6 +402,63 @@ class TestDatadogHTTPHandler:
             # (The exact behavior depends on the implementation)
 
 
+class TestMpscRing:
+    """Test suite for the internal ring buffer."""
+
+    def test_capacity_rounded_to_power_of_two(self):
+        """Test that capacity is rounded up to a power of two."""
+        ring: _MpscRing[int] = _MpscRing(10)
+
+        assert len(ring.buf) == 16
+        assert ring.mask == 15
+
+    def test_offer_and_drain_preserve_order(self):
+        """Test that items are drained in FIFO order across wraparound."""
+        ring: _MpscRing[int] = _MpscRing(4)
+        out: list[int] = []
+
+        for i in range(3):
+            assert ring.offer(i)
+        ring.drain_into(out, 2)
+        for i in range(3, 6):
+            assert ring.offer(i)
+        ring.drain_into(out, 10)
+
+        assert out == [0, 1, 2, 3, 4, 5]
+        assert len(ring) == 0
+
+    def test_offer_fails_when_full(self):
+        """Test that offering to a full ring is rejected."""
+        ring: _MpscRing[int] = _MpscRing(4)
+
+        for i in range(4):
+            assert ring.offer(i)
+
+        assert ring.offer(4) is False
+        assert len(ring) == 4
+        assert ring.dropped == 1
+
+    def test_offer_signals_at_watermark(self):
+        """Test that the consumer is only woken once the watermark is reached."""
+        ring: _MpscRing[str] = _MpscRing(8, watermark=3)
+
+        ring.offer("a")
+        ring.offer("b")
+        assert not ring.not_empty.is_set()
+
+        ring.offer("c")
+        assert ring.not_empty.is_set()
+
+    def test_offer_signals_not_empty(self):
+        """Test that publishing an item wakes the consumer."""
+        ring: _MpscRing[str] = _MpscRing(4)
+        assert not ring.not_empty.is_set()
+
+        ring.offer("item")
+
+        assert ring.not_empty.is_set()
+
+
 class TestDatadogHTTPHandlerIntegration:
     """Integration tests for DatadogHTTPHandler."""
 
@@ -220,6 +487,59 @@ class TestDatadogHTTPHandlerIntegration:
             # Verify logs were sent
             assert mock_logs_api.submit_log.call_count > 0
 
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_burst_tail_sent_without_waiting_for_interval(
+        self, mock_api_client, handler_config
+    ):
+        """Test that a burst is drained completely once the worker wakes."""
+        mock_logs_api = MagicMock()
+        handler_config["batch_size"] = 10
+        handler_config["flush_interval_seconds"] = 30.0
+
+        with patch.object(DatadogHTTPHandler, "_setup_api_client"):
+            with patch.object(DatadogHTTPHandler, "_start_worker"):
+                handler = DatadogHTTPHandler(**handler_config)
+            handler.logs_api = mock_logs_api
+
+            # One full batch plus a tail smaller than the wake-up watermark
+            for i in range(12):
+                handler.emit(logging.makeLogRecord({"msg": f"Burst {i}"}))
+            handler._start_worker()
+
+            time.sleep(0.5)
+
+            assert handler.get_queue_size() == 0
+            assert mock_logs_api.submit_log.call_count == 2
+            handler.close()
+
+    @patch("datadog_http_handler.handler.ApiClient")
+    def test_steady_load_waits_for_watermark(self, mock_api_client, handler_config):
+        """Test that logs arriving during a send wait for the wake-up threshold."""
+        batch_sizes: list[int] = []
+
+        def slow_submit(body, **kwargs):
+            batch_sizes.append(len(body.value))
+            time.sleep(0.05)
+
+        mock_logs_api = MagicMock()
+        mock_logs_api.submit_log.side_effect = slow_submit
+        handler_config["batch_size"] = 50  # Wakes up at 15 pending logs
+        handler_config["flush_interval_seconds"] = 30.0
+
+        with patch.object(DatadogHTTPHandler, "_setup_api_client"):
+            handler = DatadogHTTPHandler(**handler_config)
+            handler.logs_api = mock_logs_api
+
+            # About 100 logs per second, so only ~5 arrive during each send
+            for i in range(150):
+                handler.emit(logging.makeLogRecord({"msg": f"Steady {i}"}))
+                time.sleep(0.01)
+
+            handler.close()
+
+        assert sum(batch_sizes) == 150
+        assert sum(batch_sizes) / len(batch_sizes) >= 10
+
     @patch("datadog_http_handler.handler.ApiClient")
     def test_batch_size_triggering(self, mock_api_client, handler_config):
         """Test that batch size triggers sending."""
@@ -233,6 +553,7 @@ class TestDatadogHTTPHandlerIntegration:
             # Send exactly batch_size logs
             logger = logging.getLogger("test_batch")
             logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
 
             for i in range(3):
                 logger.info(f"Batch test {i}")
@@ -240,5 +561,5 @@ class TestDatadogHTTPHandlerIntegration:
             # Allow processing time
             time.sleep(0.5)
 
-            # Should have triggered at least one batch send
+            # Pending logs crossed the watermark well before the flush interval
             assert mock_logs_api.submit_log.call_count >= 1